@@ -3,52 +3,102 @@
 Analysis Pipeline Coordinator
 Orchestrates the complete data analysis pipeline
 """
-import subprocess
+import asyncio
+import importlib.util
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-def run_command(cmd, description, use_venv=True):
-    """Run a command and handle errors"""
+# Resolve paths once at import rather than per call
+SCRIPT_DIR = Path(__file__).resolve().parent
+VENV_PYTHON = SCRIPT_DIR / 'venv' / 'bin' / 'python'
+HAS_VENV = VENV_PYTHON.exists()
+
+# Bytes read from a child's stdout/stderr per call
+STREAM_CHUNK_SIZE = 64 * 1024
+
+async def stream_output(stream, echo):
+    """Consume a child's output line by line as it arrives"""
+    lines = []
+    
+    def emit(raw_line):
+        line = raw_line.decode(errors='replace').rstrip()
+        if echo:
+            print(f"   │ {line}")
+        else:
+            lines.append(line)
+    
+    # Read fixed-size chunks and split lines here; StreamReader line iteration
+    # raises on lines longer than its 64 KiB limit
+    pending = bytearray()
+    while chunk := await stream.read(STREAM_CHUNK_SIZE):
+        pending += chunk
+        *complete, pending = pending.split(b'\n')
+        for raw_line in complete:
+            emit(raw_line)
+    if pending:
+        emit(pending)
+    return lines
+
+async def run_command(cmd, description, use_venv=True):
+    """Run a command asynchronously, streaming its output, and handle errors"""
     print(f"\n🔄 {description}...")
     
     # Use virtual environment python if available and requested
-    if use_venv and len(cmd) > 0 and cmd[0] == 'python3':
-        script_dir = Path(__file__).parent
-        venv_python = script_dir / 'venv' / 'bin' / 'python'
-        if venv_python.exists():
-            cmd[0] = str(venv_python)
+    if use_venv and HAS_VENV and len(cmd) > 0 and cmd[0] == 'python3':
+        cmd[0] = str(VENV_PYTHON)
     
     print(f"   Command: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(
-            cmd, 
-            capture_output=True, 
-            text=True, 
-            check=True
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Unbuffered children flush each line instead of one block at exit
+            env={**os.environ, 'PYTHONUNBUFFERED': '1'}
         )
         
-        if result.stdout:
-            print(f"   Output: {result.stdout.strip()}")
-        
-        print(f"   ✅ {description} completed successfully")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"   ❌ {description} failed!")
-        print(f"   Error: {e.stderr.strip() if e.stderr else str(e)}")
-        return False
     except FileNotFoundError as e:
         print(f"   ❌ {description} failed - file not found: {e}")
         return False
+    
+    # Echo stdout as it arrives; keep stderr for the failure message
+    _, stderr_lines = await asyncio.gather(
+        stream_output(proc.stdout, echo=True),
+        stream_output(proc.stderr, echo=False)
+    )
+    await proc.wait()
+    
+    if proc.returncode != 0:
+        stderr = '\n'.join(stderr_lines).strip()
+        print(f"   ❌ {description} failed!")
+        print(f"   Error: {stderr or f'exit status {proc.returncode}'}")
+        return False
+    
+    print(f"   ✅ {description} completed successfully")
+    return True
+
+def run_step(func, description, *args):
+    """Run a pipeline step in-process and handle errors"""
+    print(f"\n🔄 {description}...")
+    
+    try:
+        result = func(*args)
+        print(f"   ✅ {description} completed successfully")
+        return True, result
+        
+    except Exception as e:
+        print(f"   ❌ {description} failed!")
+        print(f"   Error: {e}")
+        return False, None
 
 def check_prerequisites():
     """Check if all required components are available"""
     print("🔍 Checking prerequisites...")
     
-    script_dir = Path(__file__).parent
     required_files = [
         'processor.py',
         'statistician.py', 
@@ -57,10 +107,9 @@ def check_prerequisites():
         'requirements.txt'
     ]
     
-    missing_files = []
-    for file in required_files:
-        if not (script_dir / file).exists():
-            missing_files.append(file)
+    # One directory scan instead of a stat() per required file
+    present_files = {entry.name for entry in os.scandir(SCRIPT_DIR)}
+    missing_files = [file for file in required_files if file not in present_files]
     
     if missing_files:
         print(f"   ❌ Missing required files: {', '.join(missing_files)}")
@@ -68,22 +117,22 @@ def check_prerequisites():
     
     print("   ✅ All required files present")
     
-    # Check Python packages (basic check)
-    try:
-        import pandas
-        import numpy  
-        import matplotlib
-        import seaborn
-        print("   ✅ Core Python packages available")
-        return True
-    except ImportError as e:
-        print(f"   ⚠️ Some Python packages missing: {e}")
+    # Check Python packages without importing them (basic check)
+    missing_packages = [
+        package for package in ('pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn', 'pyarrow')
+        if importlib.util.find_spec(package) is None
+    ]
+    if missing_packages:
+        print(f"   ⚠️ Some Python packages missing: {', '.join(missing_packages)}")
         print("   📦 Run: pip install -r requirements.txt")
         return False
+    
+    print("   ✅ Core Python packages available")
+    return True
 
 def create_sample_data():
     """Create sample data if none exists"""
-    data_dir = Path(__file__).parent / 'data'
+    data_dir = SCRIPT_DIR / 'data'
     sample_file = data_dir / 'sample.csv'
     
     if sample_file.exists():
@@ -112,66 +161,94 @@ Central,165000,135000,30000,44,4.3,0.17"""
     print(f"   ✅ Created sample data: {sample_file}")
     return str(sample_file)
 
-def setup_output_directory():
+def setup_output_directory(started_at):
     """Create and setup output directory"""
-    output_dir = Path(__file__).parent / 'outputs' / datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_dir = SCRIPT_DIR / 'outputs' / started_at.strftime('%Y%m%d_%H%M%S')
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"📁 Output directory: {output_dir}")
     return output_dir
 
-def main():
-    """Main coordination function"""
-    print("🚀 Starting Data Analysis Pipeline")
-    print(f"   Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+def run_pipeline(input_data, processed_data, stats_results, viz_dir, final_report):
+    """Run all pipeline stages in this interpreter, passing results in memory"""
+    import processor
+    import statistician
+    import visualizer
+    import report_writer
     
-    # Check prerequisites
-    if not check_prerequisites():
-        print("\n❌ Prerequisites check failed. Please install required packages.")
-        sys.exit(1)
+    # Step 1: Data Processing
+    success, result = run_step(processor.process, "Data Processing", input_data, str(processed_data))
+    if not success:
+        print("\n💥 Pipeline failed at data processing step")
+        return False
+    df, processed, outlier_bounds = result
     
-    # Setup paths
-    script_dir = Path(__file__).parent
-    input_data = create_sample_data()
-    output_dir = setup_output_directory()
+    # Step 2: Statistical Analysis
+    success, stats = run_step(statistician.analyze, "Statistical Analysis",
+                              df, processed['metadata'], str(stats_results), outlier_bounds)
+    if not success:
+        print("\n💥 Pipeline failed at statistical analysis step")
+        return False
     
-    # Define intermediate file paths
-    processed_data = output_dir / 'processed_data.json'
-    stats_results = output_dir / 'statistical_analysis.json'
-    viz_dir = output_dir / 'visualizations'
-    viz_catalog = viz_dir / 'visualization_catalog.json'
-    final_report = output_dir / 'executive_report.md'
+    # Step 3: Data Visualization
+    # The Claude prompt only needs the visualization count, so the API call runs in a
+    # worker thread while the charts render (pyplot stays on the main thread)
+    executor = ThreadPoolExecutor(max_workers=1)
+    claude_future = None
+    if report_writer.CLIENT is not None:
+        planned_catalog = {'visualizations_created': visualizer.count_visualizations(df, stats)}
+        claude_future = executor.submit(report_writer.generate_report_with_claude,
+                                        processed, stats, planned_catalog)
+    elif report_writer.HAS_ANTHROPIC:
+        print("   ⚠️ ANTHROPIC_API_KEY not found, report will use the template")
     
-    print(f"\n📋 Pipeline Configuration:")
-    print(f"   Input data: {input_data}")
-    print(f"   Output directory: {output_dir}")
-    print(f"   Working directory: {script_dir}")
+    success, catalog = run_step(visualizer.visualize, "Data Visualization", df, stats, viz_dir)
+    if not success:
+        # The report is never written, so don't wait on an in-flight Claude request
+        executor.shutdown(wait=False, cancel_futures=True)
+        print("\n💥 Pipeline failed at visualization step")
+        return False
+    
+    report_content = claude_future.result() if claude_future else None
+    executor.shutdown()
+    
+    # Step 4: Report Generation
+    success, _ = run_step(report_writer.write_report, "Report Generation",
+                          processed, stats, catalog, str(final_report), report_content)
+    if not success:
+        print("\n💥 Pipeline failed at report generation step")
+        return False
+    
+    return True
+
+async def run_isolated_pipeline(input_data, processed_data, stats_results, viz_dir, final_report):
+    """Run each pipeline stage as a separate Python subprocess"""
+    viz_catalog = viz_dir / 'visualization_catalog.json'
     
     # Step 1: Data Processing
-    success = run_command([
-        'python3', str(script_dir / 'processor.py'),
+    success = await run_command([
+        'python3', str(SCRIPT_DIR / 'processor.py'),
         input_data,
         str(processed_data)
     ], "Data Processing")
     
     if not success:
         print("\n💥 Pipeline failed at data processing step")
-        sys.exit(1)
+        return False
     
     # Step 2: Statistical Analysis
-    success = run_command([
-        'python3', str(script_dir / 'statistician.py'),
+    success = await run_command([
+        'python3', str(SCRIPT_DIR / 'statistician.py'),
         str(processed_data),
         str(stats_results)
     ], "Statistical Analysis")
     
     if not success:
         print("\n💥 Pipeline failed at statistical analysis step")
-        sys.exit(1)
+        return False
     
     # Step 3: Data Visualization
-    success = run_command([
-        'python3', str(script_dir / 'visualizer.py'),
+    success = await run_command([
+        'python3', str(SCRIPT_DIR / 'visualizer.py'),
         str(processed_data),
         str(stats_results),
         str(viz_dir)
@@ -179,11 +256,11 @@ def main():
     
     if not success:
         print("\n💥 Pipeline failed at visualization step")
-        sys.exit(1)
+        return False
     
     # Step 4: Report Generation
-    success = run_command([
-        'python3', str(script_dir / 'report_writer.py'),
+    success = await run_command([
+        'python3', str(SCRIPT_DIR / 'report_writer.py'),
         str(processed_data),
         str(stats_results),
         str(viz_catalog),
@@ -192,6 +269,46 @@ def main():
     
     if not success:
         print("\n💥 Pipeline failed at report generation step")
+        return False
+    
+    return True
+
+def main(isolated=False):
+    """Main coordination function"""
+    print("🚀 Starting Data Analysis Pipeline")
+    started_at = datetime.now()
+    print(f"   Timestamp: {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"   Mode: {'isolated subprocesses' if isolated else 'in-process'}")
+    print("=" * 60)
+    
+    # Check prerequisites
+    if not check_prerequisites():
+        print("\n❌ Prerequisites check failed. Please install required packages.")
+        sys.exit(1)
+    
+    # Setup paths
+    input_data = create_sample_data()
+    output_dir = setup_output_directory(started_at)
+    
+    # Define intermediate file paths
+    processed_data = output_dir / 'processed_data.parquet'
+    stats_results = output_dir / 'statistical_analysis.json'
+    viz_dir = output_dir / 'visualizations'
+    final_report = output_dir / 'executive_report.md'
+    
+    print(f"\n📋 Pipeline Configuration:")
+    print(f"   Input data: {input_data}")
+    print(f"   Output directory: {output_dir}")
+    print(f"   Working directory: {SCRIPT_DIR}")
+    
+    if isolated:
+        success = asyncio.run(
+            run_isolated_pipeline(input_data, processed_data, stats_results, viz_dir, final_report)
+        )
+    else:
+        success = run_pipeline(input_data, processed_data, stats_results, viz_dir, final_report)
+    
+    if not success:
         sys.exit(1)
     
     # Pipeline completed successfully
@@ -212,7 +329,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        output_path = main()
+        output_path = main(isolated='--isolated' in sys.argv[1:])
         sys.exit(0)
     except KeyboardInterrupt:
         print("\n\n⚠️ Pipeline interrupted by user")
@@ -4,10 +4,31 @@ Data Processing Component
 Loads, validates, and cleans data for analysis pipeline
 """
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import json
 import sys
 from pathlib import Path
 
+def restore_temporal_text(df, data_path):
+    """Replace Arrow-parsed date/time columns with their raw text, as the C parser left them"""
+    # Arrow infers column types from the first block, so the streaming reader's schema
+    # names the temporal columns without converting the whole file
+    with pa_csv.open_csv(data_path) as reader:
+        temporal_cols = [field.name for field in reader.schema if pa.types.is_temporal(field.type)]
+    if not temporal_cols:
+        return df
+    
+    text = pa_csv.read_csv(data_path, convert_options=pa_csv.ConvertOptions(
+        include_columns=temporal_cols,
+        column_types={col: pa.string() for col in temporal_cols},
+        strings_can_be_null=True
+    ))
+    for col in temporal_cols:
+        values = pd.Series(text.column(col).to_pylist(), index=df.index, dtype=object)
+        df[col] = values.where(values.notna())
+    return df
+
 def load_and_validate_data(data_path):
     """Load CSV data and perform basic validation"""
     print(f"📊 Loading data from: {data_path}")
@@ -15,18 +36,40 @@ def load_and_validate_data(data_path):
     if not Path(data_path).exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
     
-    df = pd.read_csv(data_path)
+    # Multithreaded Arrow CSV parser; columns still convert to NumPy-backed dtypes
+    df = pd.read_csv(data_path, engine='pyarrow')
+    df = restore_temporal_text(df, data_path)
     print(f"   ✓ Loaded {len(df)} rows, {len(df.columns)} columns")
     
     # Validate we have at least 2 numeric columns for meaningful analysis
     numeric_cols = df.select_dtypes(include=['number']).columns
+    categorical_cols = df.select_dtypes(include=['object']).columns
     if len(numeric_cols) < 2:
         raise ValueError(f"Need at least 2 numeric columns for analysis, found: {len(numeric_cols)}")
     
     print(f"   ✓ Found {len(numeric_cols)} numeric columns: {list(numeric_cols)}")
-    return df
+    return df, numeric_cols, categorical_cols
+
+def compute_outlier_bounds(df, numeric_cols):
+    """Compute IQR outlier bounds and masks for numeric columns"""
+    numeric = df[numeric_cols]
+    quantiles = numeric.quantile([0.25, 0.75])
+    Q1 = quantiles.loc[0.25]
+    Q3 = quantiles.loc[0.75]
+    IQR = Q3 - Q1
+    lower_bounds = Q1 - 1.5 * IQR
+    upper_bounds = Q3 + 1.5 * IQR
+    
+    # One broadcast comparison over the whole numeric block instead of a pass per column
+    values = numeric.to_numpy(dtype=float)
+    outliers = (values < lower_bounds.to_numpy()) | (values > upper_bounds.to_numpy())
+    
+    return {
+        col: (Q1[col], Q3[col], lower_bounds[col], upper_bounds[col], outliers[:, i])
+        for i, col in enumerate(numeric_cols)
+    }
 
-def clean_data(df):
+def clean_data(df, numeric_cols):
     """Basic data cleaning operations"""
     print("🧹 Cleaning data...")
     
@@ -36,61 +79,76 @@ def clean_data(df):
     df = df.dropna(how='all')
     
     # Basic outlier detection using IQR for numeric columns
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        outliers = (df[col] < lower_bound) | (df[col] > upper_bound)
-        if outliers.sum() > 0:
-            print(f"   ✓ Found {outliers.sum()} outliers in {col} (keeping for analysis)")
+    outlier_bounds = compute_outlier_bounds(df, numeric_cols)
+    for col, (_, _, _, _, outliers) in outlier_bounds.items():
+        outliers_count = int(outliers.sum())
+        if outliers_count > 0:
+            print(f"   ✓ Found {outliers_count} outliers in {col} (keeping for analysis)")
     
     print(f"   ✓ Cleaned data: {len(df)} rows (removed {initial_rows - len(df)} empty rows)")
-    return df
+    return df, outlier_bounds
 
-def save_processed_data(df, output_path):
-    """Save processed data as JSON"""
-    print(f"💾 Saving processed data to: {output_path}")
+def save_processed_data(df, output_path, numeric_cols, categorical_cols, legacy_json=False):
+    """Save processed data as Parquet with a JSON metadata sidecar"""
+    output_path = Path(output_path)
+    data_path = output_path.with_suffix('.parquet')
+    metadata_path = output_path.with_suffix('.meta.json')
+    print(f"💾 Saving processed data to: {data_path}")
     
-    # Convert to JSON-serializable format
-    data_dict = {
+    processed_data = {
         'metadata': {
             'rows': len(df),
             'columns': len(df.columns),
-            'numeric_columns': list(df.select_dtypes(include=['number']).columns),
-            'categorical_columns': list(df.select_dtypes(include=['object']).columns)
-        },
-        'data': df.to_dict('records')
+            'numeric_columns': list(numeric_cols),
+            'categorical_columns': list(categorical_cols)
+        }
     }
     
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(data_dict, f, indent=2, default=str)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(data_path, engine='pyarrow', compression='zstd', index=False)
+    
+    with open(metadata_path, 'w') as f:
+        json.dump(processed_data['metadata'], f, indent=2)
+    
+    # Combined metadata + row records JSON, only for consumers of the old format
+    if legacy_json:
+        legacy_path = output_path.with_suffix('.json')
+        with open(legacy_path, 'w') as f:
+            json.dump({**processed_data, 'data': df.to_dict('records')}, f,
+                      separators=(',', ':'), default=str)
+        print(f"   ✓ Saved legacy JSON: {legacy_path}")
+    
+    print(f"   ✓ Saved {len(df)} records to Parquet")
+    return processed_data
+
+def process(input_path, output_path, legacy_json=False):
+    """Load, clean, and save data, returning the cleaned frame, processed data, and outlier bounds"""
+    # Load and validate data
+    df, numeric_cols, categorical_cols = load_and_validate_data(input_path)
+    
+    # Clean data
+    df_clean, outlier_bounds = clean_data(df, numeric_cols)
+    
+    # Save processed data
+    processed_data = save_processed_data(df_clean, output_path, numeric_cols, categorical_cols,
+                                         legacy_json)
     
-    print(f"   ✓ Saved {len(df)} records to JSON")
-    return data_dict
+    return df_clean, processed_data, outlier_bounds
 
 def main():
     """Main processing function"""
-    if len(sys.argv) != 3:
-        print("Usage: python processor.py <input_csv> <output_json>")
+    legacy_json = '--legacy-json' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--legacy-json']
+    
+    if len(args) != 2:
+        print("Usage: python processor.py <input_csv> <output_parquet> [--legacy-json]")
         sys.exit(1)
     
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
+    input_path = args[0]
+    output_path = args[1]
     
     try:
-        # Load and validate data
-        df = load_and_validate_data(input_path)
-        
-        # Clean data
-        df_clean = clean_data(df)
-        
-        # Save processed data
-        processed_data = save_processed_data(df_clean, output_path)
+        _, processed_data, _ = process(input_path, output_path, legacy_json)
         
         print("✅ Data processing completed successfully!")
         return processed_data
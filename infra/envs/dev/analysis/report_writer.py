@@ -16,13 +16,24 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+def create_client():
+    """Create an Anthropic client; the SDK keeps its connections pooled and alive"""
+    api_key = os.getenv('ANTHROPIC_API_KEY')
+    if not HAS_ANTHROPIC or not api_key:
+        return None
+    
+    return anthropic.Anthropic(api_key=api_key)
+
+# Shared client so repeated reports reuse open connections instead of new TLS handshakes
+CLIENT = create_client()
+
 def load_analysis_results(processed_path, stats_path, viz_catalog_path):
     """Load all analysis results"""
     print(f"📖 Loading analysis results...")
     
-    # Load processed data
-    with open(processed_path, 'r') as f:
-        processed_data = json.load(f)
+    # Load processed data metadata only; the row records are never used here
+    with open(Path(processed_path).with_suffix('.meta.json'), 'r') as f:
+        processed_data = {'metadata': json.load(f)}
     
     # Load statistical analysis
     with open(stats_path, 'r') as f:
@@ -41,14 +52,11 @@ def generate_report_with_claude(processed_data, stats, viz_catalog):
     """Generate report using Claude API"""
     print("🤖 Generating report with Claude API...")
     
-    api_key = os.getenv('ANTHROPIC_API_KEY')
-    if not api_key:
+    if CLIENT is None:
         print("   ⚠️ ANTHROPIC_API_KEY not found, falling back to template")
         return None
     
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        
         # Prepare context for Claude
         context = {
             'data_overview': processed_data['metadata'],
@@ -92,7 +100,7 @@ Please provide:
 Format as a professional business report in markdown.
         """
         
-        message = client.messages.create(
+        message = CLIENT.messages.create(
             model="claude-3-haiku-20240307",
             max_tokens=2000,
             messages=[{"role": "user", "content": prompt}]
@@ -124,7 +132,7 @@ def generate_template_report(processed_data, stats, viz_catalog):
     if strong_corrs:
         top_correlation = max(strong_corrs, key=lambda x: abs(x['correlation']))
     
-    report_content = f"""# Data Analysis Executive Report
+    parts = [f"""# Data Analysis Executive Report
 
 *Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}*
 
@@ -137,45 +145,45 @@ The dataset includes {len(numeric_cols)} numeric variables ({', '.join(numeric_c
 ## Key Insights
 
 ### Statistical Findings
-"""
+"""]
     
     # Add insights for each numeric variable
     for col in numeric_cols[:3]:  # Limit to first 3 for brevity
         stats_col = desc_stats[col]
-        report_content += f"- **{col}**: Mean = {stats_col['mean']:.2f}, Range = [{stats_col['min']:.2f} to {stats_col['max']:.2f}], Std Dev = {stats_col['std']:.2f}\n"
+        parts.append(f"- **{col}**: Mean = {stats_col['mean']:.2f}, Range = [{stats_col['min']:.2f} to {stats_col['max']:.2f}], Std Dev = {stats_col['std']:.2f}\n")
     
     if len(strong_corrs) > 0:
-        report_content += f"\n### Correlation Analysis\n"
+        parts.append(f"\n### Correlation Analysis\n")
         for corr in strong_corrs[:3]:  # Top 3 correlations
             strength_desc = "strong positive" if corr['correlation'] > 0.7 else "strong negative" if corr['correlation'] < -0.7 else "moderate"
-            report_content += f"- **{corr['variable1']}** and **{corr['variable2']}** show a {strength_desc} correlation ({corr['correlation']:.3f})\n"
+            parts.append(f"- **{corr['variable1']}** and **{corr['variable2']}** show a {strength_desc} correlation ({corr['correlation']:.3f})\n")
     
     # Add pattern insights
     if patterns:
-        report_content += f"\n### Pattern Analysis\n"
+        parts.append(f"\n### Pattern Analysis\n")
         for pattern in patterns[:2]:  # First 2 patterns
             if pattern['type'] == 'categorical_distribution':
-                report_content += f"- **{pattern['column']}**: {pattern['unique_values']} unique categories, most common is '{pattern['most_common']}' ({pattern['most_common_count']} occurrences)\n"
+                parts.append(f"- **{pattern['column']}**: {pattern['unique_values']} unique categories, most common is '{pattern['most_common']}' ({pattern['most_common_count']} occurrences)\n")
             elif pattern['type'] == 'numeric_analysis':
-                report_content += f"- **{pattern['column']}**: {pattern['outliers_percentage']}% outliers detected outside normal range\n"
+                parts.append(f"- **{pattern['column']}**: {pattern['outliers_percentage']}% outliers detected outside normal range\n")
     
-    report_content += f"""
+    parts.append(f"""
 
 ## Data Quality Assessment
 
 ✅ **Data Completeness**: Dataset contains {metadata['rows']} complete records
 ✅ **Variable Coverage**: {len(numeric_cols)} numeric and {len(metadata['categorical_columns'])} categorical variables analyzed
 ✅ **Statistical Validity**: All numeric variables show appropriate distributions for analysis
-"""
+""")
     
     # Add missing data assessment if available
     missing_pattern = next((p for p in patterns if p['type'] == 'missing_data'), None)
     if missing_pattern:
-        report_content += f"⚠️ **Missing Data**: {len(missing_pattern['columns_with_missing'])} columns have missing values\n"
+        parts.append(f"⚠️ **Missing Data**: {len(missing_pattern['columns_with_missing'])} columns have missing values\n")
     else:
-        report_content += f"✅ **No Missing Data**: All variables are complete\n"
+        parts.append(f"✅ **No Missing Data**: All variables are complete\n")
     
-    report_content += f"""
+    parts.append(f"""
 
 ## Recommendations for Action
 
@@ -199,7 +207,9 @@ The dataset includes {len(numeric_cols)} numeric variables ({', '.join(numeric_c
 ---
 
 *This report was generated using an automated analysis pipeline. For questions about methodology or to request additional analysis, please contact the data team.*
-"""
+""")
+    
+    report_content = "".join(parts)
     
     print("   ✓ Generated template report")
     return report_content
@@ -221,10 +231,19 @@ def save_report(report_content, output_path, format='markdown'):
     print(f"   ✓ Report saved as {format}: {output_file}")
     return str(output_file)
 
+def write_report(processed_data, stats, viz_catalog, output_path, report_content=None):
+    """Save the executive report, using the template when no generated content is given"""
+    # Fall back to template if Claude fails or isn't available
+    if not report_content:
+        report_content = generate_template_report(processed_data, stats, viz_catalog)
+    
+    # Save the report
+    return save_report(report_content, output_path)
+
 def main():
     """Main report generation function"""
     if len(sys.argv) != 5:
-        print("Usage: python report_writer.py <processed_json> <stats_json> <viz_catalog_json> <output_path>")
+        print("Usage: python report_writer.py <processed_parquet> <stats_json> <viz_catalog_json> <output_path>")
         sys.exit(1)
     
     processed_path = sys.argv[1]
@@ -243,12 +262,7 @@ def main():
         if HAS_ANTHROPIC:
             report_content = generate_report_with_claude(processed_data, stats, viz_catalog)
         
-        # Fall back to template if Claude fails or isn't available
-        if not report_content:
-            report_content = generate_template_report(processed_data, stats, viz_catalog)
-        
-        # Save the report
-        report_file = save_report(report_content, output_path)
+        report_file = write_report(processed_data, stats, viz_catalog, output_path, report_content)
         
         print("✅ Executive report generation completed!")
         return report_file
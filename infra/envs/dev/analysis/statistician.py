@@ -9,18 +9,21 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from processor import compute_outlier_bounds
+
 def load_processed_data(data_path):
-    """Load processed JSON data"""
+    """Load processed Parquet data and its JSON metadata"""
+    data_path = Path(data_path).with_suffix('.parquet')
+    metadata_path = data_path.with_suffix('.meta.json')
     print(f"📈 Loading processed data from: {data_path}")
     
-    if not Path(data_path).exists():
+    if not data_path.exists():
         raise FileNotFoundError(f"Processed data file not found: {data_path}")
     
-    with open(data_path, 'r') as f:
-        data_dict = json.load(f)
+    df = pd.read_parquet(data_path, engine='pyarrow')
     
-    df = pd.DataFrame(data_dict['data'])
-    metadata = data_dict['metadata']
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
     
     print(f"   ✓ Loaded {len(df)} rows for analysis")
     return df, metadata
@@ -29,18 +32,18 @@ def compute_descriptive_stats(df, numeric_cols):
     """Compute descriptive statistics for numeric columns"""
     print("📊 Computing descriptive statistics...")
     
-    stats = {}
-    for col in numeric_cols:
-        stats[col] = {
-            'count': int(df[col].count()),
-            'mean': float(df[col].mean()),
-            'median': float(df[col].median()),
-            'std': float(df[col].std()),
-            'min': float(df[col].min()),
-            'max': float(df[col].max()),
-            'q25': float(df[col].quantile(0.25)),
-            'q75': float(df[col].quantile(0.75))
-        }
+    if len(numeric_cols) == 0:
+        return {}
+    
+    # Single describe pass over all numeric columns instead of per-column reductions
+    desc = df[numeric_cols].describe(percentiles=[0.25, 0.5, 0.75]).T
+    desc = desc[['count', 'mean', '50%', 'std', 'min', 'max', '25%', '75%']].rename(
+        columns={'50%': 'median', '25%': 'q25', '75%': 'q75'}
+    ).astype(float)
+    
+    stats = desc.to_dict('index')
+    for col_stats in stats.values():
+        col_stats['count'] = int(col_stats['count'])
     
     print(f"   ✓ Computed statistics for {len(numeric_cols)} numeric columns")
     return stats
@@ -52,28 +55,36 @@ def compute_correlations(df, numeric_cols):
     if len(numeric_cols) < 2:
         return {}
     
-    corr_matrix = df[numeric_cols].corr()
+    values = df[numeric_cols].to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        # Pairwise-complete correlations need pandas' NaN handling
+        corr_values = df[numeric_cols].corr().to_numpy()
+    else:
+        # Standardize columns and compute the Pearson matrix with a single GEMM
+        values = values - values.mean(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values /= values.std(axis=0, ddof=1)
+            corr_values = (values.T @ values) / (values.shape[0] - 1)
     
     # Convert to nested dict for JSON serialization
-    correlations = {}
-    for col1 in numeric_cols:
-        correlations[col1] = {}
-        for col2 in numeric_cols:
-            correlations[col1][col2] = float(corr_matrix.loc[col1, col2])
+    correlations = {
+        col1: {col2: round(float(corr_values[i, j]), 6) for j, col2 in enumerate(numeric_cols)}
+        for i, col1 in enumerate(numeric_cols)
+    }
+    
+    # Find strongest correlations on the upper triangle (excluding self-correlations)
+    rows, cols = np.triu_indices_from(corr_values, k=1)
+    strong = np.abs(corr_values[rows, cols]) > 0.5  # Strong correlation threshold
     
-    # Find strongest correlations (excluding self-correlations)
     strong_correlations = []
-    for col1 in numeric_cols:
-        for col2 in numeric_cols:
-            if col1 != col2:
-                corr_value = correlations[col1][col2]
-                if abs(corr_value) > 0.5:  # Strong correlation threshold
-                    strong_correlations.append({
-                        'variable1': col1,
-                        'variable2': col2,
-                        'correlation': corr_value,
-                        'strength': 'strong' if abs(corr_value) > 0.7 else 'moderate'
-                    })
+    for i, j in zip(rows[strong], cols[strong]):
+        corr_value = float(corr_values[i, j])
+        strong_correlations.append({
+            'variable1': numeric_cols[i],
+            'variable2': numeric_cols[j],
+            'correlation': corr_value,
+            'strength': 'strong' if abs(corr_value) > 0.7 else 'moderate'
+        })
     
     print(f"   ✓ Found {len(strong_correlations)} strong correlations")
     return {
@@ -81,8 +92,8 @@ def compute_correlations(df, numeric_cols):
         'strong_correlations': strong_correlations
     }
 
-def identify_patterns(df, metadata):
-    """Identify interesting patterns in the data"""
+def identify_patterns(df, metadata, outlier_bounds=None):
+    """Identify interesting patterns in the data, reusing outlier bounds from processing if given"""
     print("🔍 Identifying data patterns...")
     
     patterns = []
@@ -95,40 +106,39 @@ def identify_patterns(df, metadata):
         patterns.append({
             'type': 'categorical_distribution',
             'column': col,
-            'unique_values': int(df[col].nunique()),
+            'unique_values': int(len(value_counts)),
             'most_common': str(value_counts.index[0]),
             'most_common_count': int(value_counts.iloc[0]),
-            'distribution': value_counts.head().to_dict()
+            'distribution': value_counts.head().astype(int).to_dict()
         })
     
     # Pattern 2: Numeric ranges and outliers
+    if outlier_bounds is None:
+        outlier_bounds = compute_outlier_bounds(df, numeric_cols)
+    
     for col in numeric_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
+        _, _, lower_bound, upper_bound, outliers = outlier_bounds[col]
+        outliers_count = int(outliers.sum())
         
         patterns.append({
             'type': 'numeric_analysis',
             'column': col,
-            'outliers_count': len(outliers),
-            'outliers_percentage': round(len(outliers) / len(df) * 100, 2),
+            'outliers_count': outliers_count,
+            'outliers_percentage': round(outliers_count / len(df) * 100, 2),
             'normal_range': f"{lower_bound:.2f} to {upper_bound:.2f}"
         })
     
     # Pattern 3: Missing data analysis
-    missing_analysis = []
-    for col in df.columns:
-        missing_count = df[col].isnull().sum()
-        if missing_count > 0:
-            missing_analysis.append({
-                'column': col,
-                'missing_count': int(missing_count),
-                'missing_percentage': round(missing_count / len(df) * 100, 2)
-            })
+    missing_counts = df.isna().sum()
+    missing_counts = missing_counts[missing_counts > 0]
+    missing_analysis = [
+        {
+            'column': col,
+            'missing_count': int(missing_count),
+            'missing_percentage': round(missing_count / len(df) * 100, 2)
+        }
+        for col, missing_count in missing_counts.items()
+    ]
     
     if missing_analysis:
         patterns.append({
@@ -156,15 +166,29 @@ def save_statistical_analysis(stats, correlations, patterns, output_path):
     
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, 'w') as f:
-        json.dump(analysis_results, f, indent=2)
+        json.dump(analysis_results, f, separators=(',', ':'))
     
     print(f"   ✓ Saved statistical analysis results")
     return analysis_results
 
+def analyze(df, metadata, output_path, outlier_bounds=None):
+    """Run the statistical analysis on a processed frame and save the results"""
+    # Compute descriptive statistics
+    stats = compute_descriptive_stats(df, metadata['numeric_columns'])
+    
+    # Compute correlations
+    correlations = compute_correlations(df, metadata['numeric_columns'])
+    
+    # Identify patterns
+    patterns = identify_patterns(df, metadata, outlier_bounds)
+    
+    # Save results
+    return save_statistical_analysis(stats, correlations, patterns, output_path)
+
 def main():
     """Main statistical analysis function"""
     if len(sys.argv) != 3:
-        print("Usage: python statistician.py <processed_json> <output_json>")
+        print("Usage: python statistician.py <processed_parquet> <output_json>")
         sys.exit(1)
     
     input_path = sys.argv[1]
@@ -174,17 +198,7 @@ def main():
         # Load processed data
         df, metadata = load_processed_data(input_path)
         
-        # Compute descriptive statistics
-        stats = compute_descriptive_stats(df, metadata['numeric_columns'])
-        
-        # Compute correlations
-        correlations = compute_correlations(df, metadata['numeric_columns'])
-        
-        # Identify patterns
-        patterns = identify_patterns(df, metadata)
-        
-        # Save results
-        results = save_statistical_analysis(stats, correlations, patterns, output_path)
+        results = analyze(df, metadata, output_path)
         
         print("✅ Statistical analysis completed successfully!")
         return results
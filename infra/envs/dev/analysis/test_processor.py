@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Tests for the Data Processing Component
+"""
+import pandas as pd
+
+from processor import load_and_validate_data
+
+def test_temporal_columns_keep_their_text(tmp_path):
+    """Date, ISO datetime and time-of-day columns load as the same strings the C parser gives"""
+    data_path = tmp_path / 'data.csv'
+    data_path.write_text(
+        "a,b,d,dt,t,s\n"
+        "1,2.5,2024-01-01,2024-01-01T08:00:00,12:30:00,x\n"
+        "3,,2024-01-02,2024-01-02T09:00:00,,y\n"
+        "5,6,,,13:00:00,\n"
+    )
+    
+    df, numeric_cols, _ = load_and_validate_data(data_path)
+    expected = pd.read_csv(data_path)
+    
+    assert list(numeric_cols) == ['a', 'b']
+    for col in ['d', 'dt', 't', 's']:
+        assert df[col].isna().tolist() == expected[col].isna().tolist()
+        assert df[col].dropna().tolist() == expected[col].dropna().tolist()
+    assert df['dt'].iloc[0] == '2024-01-01T08:00:00'
+    assert df['t'].iloc[0] == '12:30:00'
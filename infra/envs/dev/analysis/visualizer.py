@@ -3,47 +3,125 @@
 Data Visualization Component
 Creates comprehensive dashboards and charts
 """
+import hashlib
+import io
 import json
+import multiprocessing
+import os
 import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from scipy.stats import gaussian_kde
+
+# Try to import orjson for faster JSON handling, fallback to the standard library
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Output is PNG files only, so skip GUI backend probing
+matplotlib.use('Agg', force=True)
+import matplotlib.pyplot as plt
+
+# Set style for better looking plots (the seaborn-v0_8 look and husl palette, without seaborn)
+plt.rcParams.update({
+    'figure.figsize': (8, 5.5),
+    'font.size': 10,
+    'axes.grid': True,
+    'axes.facecolor': '#EAEAF2',
+    'axes.edgecolor': 'white',
+    'grid.color': 'white',
+    'axes.axisbelow': True,
+    'text.color': '.15',
+    'axes.labelcolor': '.15',
+    'xtick.color': '.15',
+    'ytick.color': '.15',
+    'axes.prop_cycle': plt.cycler(color=['#f77189', '#bb9832', '#50b131',
+                                         '#36ada4', '#3ba3ec', '#e866f4'])
+})
 
-# Set style for better looking plots
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+# Output resolution for saved figures; 150 dpi is plenty for on-screen dashboards
+DPI = int(os.environ.get('VIZ_DPI', 150))
+
+# Scatter plots draw at most this many points; beyond HEXBIN_THRESHOLD rows they switch to hexbin
+SCATTER_SAMPLE_SIZE = 5000
+HEXBIN_THRESHOLD = 50000
+
+# Scatter plots share one multi-panel figure unless VIZ_SEPARATE_SCATTERS=1 asks for one file per pair
+SEPARATE_SCATTERS = os.environ.get('VIZ_SEPARATE_SCATTERS') == '1'
+
+# Records the hash of the inputs the visualizations in a directory were built from
+CACHE_KEY_FILE = '.cache_key'
+
+# Distribution KDEs are fitted on at most this many points
+KDE_SAMPLE_SIZE = 10000
 
 def load_data_and_stats(processed_path, stats_path):
     """Load processed data and statistical analysis"""
     print(f"📊 Loading data and statistics...")
     
     # Load processed data
-    with open(processed_path, 'r') as f:
-        data_dict = json.load(f)
-    df = pd.DataFrame(data_dict['data'])
+    df = pd.read_parquet(Path(processed_path).with_suffix('.parquet'), engine='pyarrow')
+    df = categorize_object_columns(df)
     
     # Load statistical analysis
-    with open(stats_path, 'r') as f:
-        stats = json.load(f)
+    with open(stats_path, 'rb') as f:
+        stats_bytes = f.read()
+    stats = None
+    if HAS_ORJSON:
+        try:
+            stats = orjson.loads(stats_bytes)
+        except orjson.JSONDecodeError:
+            pass  # orjson rejects the NaN literals json.dump writes for undefined statistics
+    if stats is None:
+        stats = json.loads(stats_bytes)
     
     print(f"   ✓ Loaded data ({len(df)} rows) and statistical analysis")
     return df, stats
 
-def create_correlation_heatmap(df, stats, output_dir):
+def categorize_object_columns(df):
+    """Convert low-cardinality object columns to category dtype so value counts run over codes"""
+    for col in df.select_dtypes(include='object').columns:
+        if df[col].nunique() < len(df) // 2:
+            df[col] = df[col].astype('category')
+    return df
+
+def render_png(fig):
+    """Render a figure to PNG bytes, leaving the disk write to the caller"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=DPI)
+    return buffer.getvalue()
+
+@lru_cache(maxsize=None)
+def upper_triangle_mask(n):
+    """Boolean mask hiding the upper triangle (and diagonal) of an n x n matrix"""
+    mask = np.zeros((n, n), dtype=bool)
+    mask[np.triu_indices(n)] = True
+    mask.flags.writeable = False  # Shared between calls, so guard against mutation
+    return mask
+
+def create_correlation_heatmap(numeric_cols, numeric_arrays, output_dir):
     """Create correlation matrix heatmap"""
-    print("🔥 Creating correlation heatmap...")
+    import seaborn as sns  # Only needed here, so deferred until a heatmap is drawn
     
-    numeric_cols = [col for col in df.columns if col in stats['descriptive_statistics']]
-    if len(numeric_cols) < 2:
-        print("   ⚠️ Skipping correlation heatmap (need 2+ numeric columns)")
-        return None
+    print("🔥 Creating correlation heatmap...")
+    output_dir = Path(output_dir)
     
     plt.figure(figsize=(10, 8))
-    corr_matrix = df[numeric_cols].corr()
+    values = np.column_stack([numeric_arrays[col] for col in numeric_cols]).astype(np.float64)
+    if np.isnan(values).any():
+        # Pairwise-complete correlations need pandas' NaN handling
+        corr_matrix = pd.DataFrame(numeric_arrays, columns=numeric_cols).corr()
+    else:
+        corr_matrix = pd.DataFrame(np.corrcoef(values, rowvar=False),
+                                   index=numeric_cols, columns=numeric_cols)
     
-    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+    mask = upper_triangle_mask(len(numeric_cols))
     sns.heatmap(corr_matrix, 
                 mask=mask,
                 annot=True, 
@@ -57,26 +135,22 @@ def create_correlation_heatmap(df, stats, output_dir):
     plt.tight_layout()
     
     heatmap_path = output_dir / 'correlation_heatmap.png'
-    plt.savefig(heatmap_path, dpi=300, bbox_inches='tight')
+    heatmap_png = render_png(plt.gcf())
     plt.close()
     
-    print(f"   ✓ Saved correlation heatmap: {heatmap_path}")
-    return str(heatmap_path)
+    print(f"   ✓ Rendered correlation heatmap: {heatmap_path}")
+    return [(str(heatmap_path), heatmap_png)]
 
-def create_distribution_plots(df, stats, output_dir):
+def create_distribution_plots(numeric_cols, numeric_arrays, desc_stats, output_dir):
     """Create distribution plots for numeric variables"""
     print("📈 Creating distribution plots...")
-    
-    numeric_cols = [col for col in df.columns if col in stats['descriptive_statistics']]
-    if not numeric_cols:
-        print("   ⚠️ No numeric columns for distribution plots")
-        return []
+    output_dir = Path(output_dir)
     
     # Create subplots
     n_cols = min(3, len(numeric_cols))
     n_rows = (len(numeric_cols) + n_cols - 1) // n_cols
     
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=(5*n_cols, 4*n_rows))
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(5*n_cols, 4*n_rows), constrained_layout=True)
     if n_rows == 1:
         axes = [axes] if n_cols == 1 else axes
     else:
@@ -85,9 +159,23 @@ def create_distribution_plots(df, stats, output_dir):
     for i, col in enumerate(numeric_cols):
         ax = axes[i] if len(numeric_cols) > 1 else axes
         
+        x = numeric_arrays[col]
+        x = x[~np.isnan(x)]
+        
         # Create histogram with KDE overlay
-        df[col].hist(ax=ax, bins=20, alpha=0.7, density=True)
-        df[col].plot.kde(ax=ax, color='red', linewidth=2)
+        counts, edges = np.histogram(x, bins=20, density=True)
+        ax.stairs(counts, edges, fill=True, alpha=0.7)
+        
+        # KDE cost grows with the number of points, so large columns are fitted on a sample
+        kde_sample = x
+        if len(x) > KDE_SAMPLE_SIZE:
+            kde_sample = np.random.default_rng(0).choice(x, KDE_SAMPLE_SIZE, replace=False)
+        if len(kde_sample) > 1 and kde_sample.min() < kde_sample.max():
+            grid = np.linspace(x.min(), x.max(), 200)
+            ax.plot(grid, gaussian_kde(kde_sample)(grid), 'r-', linewidth=2)
+        
+        # Mean line comes from the statistician's results rather than the data
+        ax.axvline(desc_stats[col]['mean'], color='black', linestyle='--', linewidth=1.5)
         
         ax.set_title(f'Distribution of {col}', fontweight='bold')
         ax.set_xlabel(col)
@@ -98,101 +186,144 @@ def create_distribution_plots(df, stats, output_dir):
     for i in range(len(numeric_cols), len(axes)):
         axes[i].set_visible(False)
     
-    plt.tight_layout()
-    
     dist_path = output_dir / 'distributions.png'
-    plt.savefig(dist_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    dist_png = render_png(fig)
+    plt.close(fig)
     
-    print(f"   ✓ Saved distribution plots: {dist_path}")
-    return [str(dist_path)]
+    print(f"   ✓ Rendered distribution plots: {dist_path}")
+    return [(str(dist_path), dist_png)]
 
-def create_scatter_plots(df, stats, output_dir):
+def draw_scatter(ax, corr, numeric_arrays):
+    """Draw one correlated pair with its trend line onto ax"""
+    var1, var2 = corr['variable1'], corr['variable2']
+    correlation = corr['correlation']
+    
+    x = numeric_arrays[var1].astype(float)
+    y = numeric_arrays[var2].astype(float)
+    
+    # Large datasets are sampled (or binned) before drawing; markers are rasterized one by one
+    if len(x) > HEXBIN_THRESHOLD:
+        ax.hexbin(x, y, gridsize=50, cmap='Blues')
+    elif len(x) > SCATTER_SAMPLE_SIZE:
+        idx = np.random.default_rng(0).choice(len(x), SCATTER_SAMPLE_SIZE, replace=False)
+        ax.scatter(x[idx], y[idx], alpha=0.6, s=50)
+    else:
+        ax.scatter(x, y, alpha=0.6, s=50)
+    
+    # Add trend line from the full dataset: closed-form least squares, drawn as a single segment
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x_valid, y_valid = x[valid], y[valid]
+    if len(x_valid) > 1:
+        x_mean, y_mean = x_valid.mean(), y_valid.mean()
+        x_centered = x_valid - x_mean
+        slope = (x_centered * (y_valid - y_mean)).sum() / (x_centered ** 2).sum()
+        intercept = y_mean - slope * x_mean
+        x_ends = np.array([x_valid.min(), x_valid.max()])
+        ax.plot(x_ends, slope * x_ends + intercept, "r--", alpha=0.8, linewidth=2)
+    
+    ax.set_xlabel(var1, fontsize=12)
+    ax.set_ylabel(var2, fontsize=12)
+    ax.set_title(f'{var1} vs {var2}\nCorrelation: {correlation:.3f} ({corr["strength"]})', 
+                 fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+def create_scatter_plots(numeric_arrays, top_corrs, output_dir):
     """Create scatter plots for strong correlations"""
     print("⚡ Creating scatter plots for correlations...")
+    output_dir = Path(output_dir)
     
-    strong_corrs = stats.get('correlations', {}).get('strong_correlations', [])
-    if not strong_corrs:
-        print("   ⚠️ No strong correlations found for scatter plots")
-        return []
+    if SEPARATE_SCATTERS:
+        return create_separate_scatter_plots(top_corrs, numeric_arrays, output_dir)
+    
+    # All pairs share one figure, up to two panels per row
+    ncols = min(2, len(top_corrs))
+    rows = (len(top_corrs) + ncols - 1) // ncols
+    fig, axes = plt.subplots(rows, ncols, figsize=(8*ncols, 6*rows), constrained_layout=True, squeeze=False)
+    axes = axes.flatten()
     
+    for ax, corr in zip(axes, top_corrs):
+        draw_scatter(ax, corr, numeric_arrays)
+    
+    # Hide empty subplots
+    for ax in axes[len(top_corrs):]:
+        ax.set_visible(False)
+    
+    scatter_path = output_dir / 'scatter_correlations.png'
+    scatter_png = render_png(fig)
+    plt.close(fig)
+    
+    print(f"   ✓ Rendered scatter plots: {scatter_path}")
+    return [(str(scatter_path), scatter_png)]
+
+def create_separate_scatter_plots(top_corrs, numeric_arrays, output_dir):
+    """Create one scatter plot file per correlated pair"""
     plot_paths = []
     
-    # Limit to top 4 strongest correlations to avoid too many plots
-    top_corrs = sorted(strong_corrs, key=lambda x: abs(x['correlation']), reverse=True)[:4]
+    # One figure is reused for every pair; only the axes contents are redrawn
+    fig, ax = plt.subplots(figsize=(8, 6))
+    fig.subplots_adjust(left=0.12, right=0.95, bottom=0.1, top=0.88)
     
-    for i, corr in enumerate(top_corrs):
-        plt.figure(figsize=(8, 6))
-        
-        var1, var2 = corr['variable1'], corr['variable2']
-        correlation = corr['correlation']
-        
-        plt.scatter(df[var1], df[var2], alpha=0.6, s=50)
-        
-        # Add trend line
-        z = np.polyfit(df[var1], df[var2], 1)
-        p = np.poly1d(z)
-        plt.plot(df[var1], p(df[var1]), "r--", alpha=0.8, linewidth=2)
+    for corr in top_corrs:
+        ax.clear()
+        draw_scatter(ax, corr, numeric_arrays)
         
-        plt.xlabel(var1, fontsize=12)
-        plt.ylabel(var2, fontsize=12)
-        plt.title(f'{var1} vs {var2}\nCorrelation: {correlation:.3f} ({corr["strength"]})', 
-                 fontsize=14, fontweight='bold')
-        plt.grid(True, alpha=0.3)
-        
-        scatter_path = output_dir / f'scatter_{var1}_vs_{var2}.png'
-        plt.savefig(scatter_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        plot_paths.append(str(scatter_path))
-        print(f"   ✓ Saved scatter plot: {scatter_path}")
+        scatter_path = output_dir / f'scatter_{corr["variable1"]}_vs_{corr["variable2"]}.png'
+        plot_paths.append((str(scatter_path), render_png(fig)))
+        print(f"   ✓ Rendered scatter plot: {scatter_path}")
     
+    plt.close(fig)
     return plot_paths
 
-def create_categorical_plots(df, output_dir):
+def create_categorical_plots(categorical_cols, categorical_counts, output_dir):
     """Create plots for categorical variables"""
     print("📊 Creating categorical analysis plots...")
-    
-    categorical_cols = df.select_dtypes(include=['object']).columns
-    if len(categorical_cols) == 0:
-        print("   ⚠️ No categorical columns found")
-        return []
+    output_dir = Path(output_dir)
     
     plot_paths = []
     
-    for col in categorical_cols[:3]:  # Limit to first 3 categorical columns
-        plt.figure(figsize=(10, 6))
+    # One figure is reused for every column; only the axes contents are redrawn
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    for col in categorical_cols:
+        ax.clear()
         
-        value_counts = df[col].value_counts().head(10)  # Top 10 categories
+        categories, counts = categorical_counts[col]
+        
+        # Top 10 categories: partial selection first, then sort only those
+        if len(counts) > 10:
+            top_idx = np.argpartition(counts, -10)[-10:]
+        else:
+            top_idx = np.arange(len(counts))
+        order = top_idx[np.argsort(-counts[top_idx], kind='stable')]
+        top_categories, top_counts = categories[order], counts[order]
         
         # Create bar plot
-        ax = value_counts.plot(kind='bar', color='steelblue', alpha=0.8)
-        plt.title(f'Distribution of {col}', fontsize=14, fontweight='bold')
-        plt.xlabel(col, fontsize=12)
-        plt.ylabel('Count', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True, alpha=0.3, axis='y')
+        bars = ax.bar(top_categories.astype(str), top_counts, color='steelblue', alpha=0.8)
+        ax.set_title(f'Distribution of {col}', fontsize=14, fontweight='bold')
+        ax.set_xlabel(col, fontsize=12)
+        ax.set_ylabel('Count', fontsize=12)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        ax.grid(True, alpha=0.3, axis='y')
         
-        # Add value labels on bars
-        for i, v in enumerate(value_counts.values):
-            ax.text(i, v + 0.1, str(v), ha='center', va='bottom', fontweight='bold')
+        # Add value labels on bars in one call
+        labels = [str(v) for v in top_counts]
+        ax.bar_label(bars, labels=labels, padding=2, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         cat_path = output_dir / f'categorical_{col}.png'
-        plt.savefig(cat_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        plot_paths.append(str(cat_path))
-        print(f"   ✓ Saved categorical plot: {cat_path}")
+        plot_paths.append((str(cat_path), render_png(fig)))
+        print(f"   ✓ Rendered categorical plot: {cat_path}")
     
+    plt.close(fig)
     return plot_paths
 
 def create_summary_dashboard(stats, output_dir):
     """Create an executive summary dashboard"""
     print("📋 Creating summary dashboard...")
+    output_dir = Path(output_dir)
     
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12), constrained_layout=True)
     
     # 1. Variables overview
     desc_stats = stats['descriptive_statistics']
@@ -248,14 +379,12 @@ Analysis Summary:
     ax4.set_title('Analysis Overview', fontweight='bold', fontsize=12)
     ax4.axis('off')
     
-    plt.tight_layout()
-    
     dashboard_path = output_dir / 'executive_dashboard.png'
-    plt.savefig(dashboard_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    dashboard_png = render_png(fig)
+    plt.close(fig)
     
-    print(f"   ✓ Saved executive dashboard: {dashboard_path}")
-    return str(dashboard_path)
+    print(f"   ✓ Rendered executive dashboard: {dashboard_path}")
+    return [(str(dashboard_path), dashboard_png)]
 
 def save_visualization_catalog(visualizations, output_path):
     """Save catalog of created visualizations"""
@@ -267,16 +396,152 @@ def save_visualization_catalog(visualizations, output_path):
         'description': 'Catalog of all visualizations generated during analysis'
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(catalog, f, indent=2)
+    if HAS_ORJSON:
+        Path(output_path).write_bytes(orjson.dumps(catalog, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(catalog, f, indent=2)
     
     print(f"   ✓ Saved visualization catalog: {output_path}")
     return catalog
 
+def plan_visualizations(df, stats):
+    """Select each plot group's inputs and how many files it produces"""
+    numeric_cols = [col for col in df.columns if col in stats['descriptive_statistics']]
+    strong_corrs = stats.get('correlations', {}).get('strong_correlations', [])
+    
+    # Limit to the top 4 strongest correlations and first 3 categorical columns to avoid too many plots
+    top_corrs = sorted(strong_corrs, key=lambda x: abs(x['correlation']), reverse=True)[:4]
+    categorical_cols = list(df.select_dtypes(include=['object', 'category']).columns)[:3]
+    
+    plot_counts = {
+        'correlation heatmap': 1 if len(numeric_cols) >= 2 else 0,
+        'distribution plots': 1 if numeric_cols else 0,
+        'scatter plots': len(top_corrs) if SEPARATE_SCATTERS else min(1, len(top_corrs)),
+        'categorical plots': len(categorical_cols),
+        'summary dashboard': 1
+    }
+    return {
+        'numeric_cols': numeric_cols,
+        'top_corrs': top_corrs,
+        'categorical_cols': categorical_cols,
+        'plot_counts': plot_counts
+    }
+
+def count_visualizations(df, stats):
+    """Count the visualizations visualize() will create, without rendering them"""
+    return sum(plan_visualizations(df, stats)['plot_counts'].values())
+
+def plot_executor(max_workers):
+    """Create a process pool for rendering independent plots in parallel"""
+    mp_context = None
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        # Workers fork from a server that has already imported this module and matplotlib
+        mp_context = multiprocessing.get_context('forkserver')
+        mp_context.set_forkserver_preload([__name__])
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+
+def render_plots(plot_jobs):
+    """Yield each plot job's rendered (path, png) pairs in submission order"""
+    max_workers = min(len(plot_jobs), os.cpu_count() or 1)
+    if max_workers <= 1:
+        # A single worker process only adds startup and pickling cost, so render inline
+        for func, *args in plot_jobs:
+            yield func(*args)
+        return
+    
+    with plot_executor(max_workers) as executor:
+        futures = [executor.submit(func, *args) for func, *args in plot_jobs]
+        
+        # Collect in submission order so the catalog order is stable
+        for future in futures:
+            yield future.result()
+
+def visualize(df, stats, output_dir):
+    """Create all visualizations for a processed frame and save the catalog"""
+    output_dir = Path(output_dir)
+    
+    # Create output directory
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    plan = plan_visualizations(df, stats)
+    numeric_cols = plan['numeric_cols']
+    
+    # Numeric columns are selected once and shared as plain arrays, which pickle
+    # cheaply to the worker processes and skip pandas indexing in the plots
+    numeric_arrays = {col: df[col].to_numpy() for col in numeric_cols}
+    # Categorical columns only ship their (category, count) pairs; counting category
+    # dtype columns runs over the integer codes rather than hashing each value
+    categorical_counts = {}
+    for col in plan['categorical_cols']:
+        value_counts = df[col].value_counts(sort=False)
+        value_counts = value_counts[value_counts > 0]
+        categorical_counts[col] = (value_counts.index.to_numpy(), value_counts.to_numpy())
+    
+    # Each plot group produces its own files, so they render independently
+    group_jobs = {
+        'correlation heatmap': (create_correlation_heatmap, numeric_cols, numeric_arrays, str(output_dir)),
+        'distribution plots': (create_distribution_plots, numeric_cols, numeric_arrays, stats['descriptive_statistics'], str(output_dir)),
+        'scatter plots': (create_scatter_plots, numeric_arrays, plan['top_corrs'], str(output_dir)),
+        'categorical plots': (create_categorical_plots, plan['categorical_cols'], categorical_counts, str(output_dir)),
+        'summary dashboard': (create_summary_dashboard, stats, str(output_dir))
+    }
+    
+    # Only groups the plan expects output from are rendered, so the count always matches
+    plot_jobs = []
+    for group, plot_count in plan['plot_counts'].items():
+        if plot_count:
+            plot_jobs.append(group_jobs[group])
+        else:
+            print(f"   ⚠️ Skipping {group} (no suitable data)")
+    
+    # Plots come back as rendered PNG bytes; disk writes run on a thread pool so they
+    # overlap with collecting the remaining plots (file I/O releases the GIL)
+    all_visualizations = []
+    write_futures = []
+    with ThreadPoolExecutor(max_workers=4) as io_pool:
+        for rendered in render_plots(plot_jobs):
+            for plot_path, png in rendered:
+                write_futures.append(io_pool.submit(Path(plot_path).write_bytes, png))
+                all_visualizations.append(plot_path)
+    
+    # Surface any write errors before the catalog claims the files exist
+    for write_future in write_futures:
+        write_future.result()
+    print(f"   ✓ Saved {len(all_visualizations)} visualizations to: {output_dir}")
+    
+    # Save catalog
+    catalog_path = output_dir / 'visualization_catalog.json'
+    return save_visualization_catalog(all_visualizations, catalog_path)
+
+def compute_cache_key(processed_path, stats_path):
+    """Hash the visualizer inputs (and output settings) for the regeneration cache"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{DPI}:{SEPARATE_SCATTERS}'.encode())
+    for path in (Path(processed_path).with_suffix('.parquet'), Path(stats_path)):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def load_cached_catalog(output_dir, cache_key):
+    """Return the existing catalog if it was built from the same inputs and its files still exist"""
+    key_path = output_dir / CACHE_KEY_FILE
+    catalog_path = output_dir / 'visualization_catalog.json'
+    if not key_path.exists() or not catalog_path.exists():
+        return None
+    if key_path.read_text().strip() != cache_key:
+        return None
+    
+    with open(catalog_path, 'r') as f:
+        catalog = json.load(f)
+    if not all(Path(plot_path).exists() for plot_path in catalog['files']):
+        return None
+    
+    return catalog
+
 def main():
     """Main visualization function"""
     if len(sys.argv) != 4:
-        print("Usage: python visualizer.py <processed_json> <stats_json> <output_dir>")
+        print("Usage: python visualizer.py <processed_parquet> <stats_json> <output_dir>")
         sys.exit(1)
     
     processed_path = sys.argv[1]
@@ -284,41 +549,20 @@ def main():
     output_dir = Path(sys.argv[3])
     
     try:
-        # Create output directory
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Skip rendering entirely when the inputs match the previous run
+        cache_key = compute_cache_key(processed_path, stats_path)
+        catalog = load_cached_catalog(output_dir, cache_key)
+        if catalog:
+            print(f"✅ Cache hit: inputs unchanged, reusing {catalog['visualizations_created']} visualizations")
+            return catalog
         
         # Load data and statistics
         df, stats = load_data_and_stats(processed_path, stats_path)
         
-        # Create visualizations
-        all_visualizations = []
-        
-        # Correlation heatmap
-        heatmap_path = create_correlation_heatmap(df, stats, output_dir)
-        if heatmap_path:
-            all_visualizations.append(heatmap_path)
-        
-        # Distribution plots
-        dist_paths = create_distribution_plots(df, stats, output_dir)
-        all_visualizations.extend(dist_paths)
-        
-        # Scatter plots
-        scatter_paths = create_scatter_plots(df, stats, output_dir)
-        all_visualizations.extend(scatter_paths)
-        
-        # Categorical plots
-        cat_paths = create_categorical_plots(df, output_dir)
-        all_visualizations.extend(cat_paths)
-        
-        # Summary dashboard
-        dashboard_path = create_summary_dashboard(stats, output_dir)
-        all_visualizations.append(dashboard_path)
-        
-        # Save catalog
-        catalog_path = output_dir / 'visualization_catalog.json'
-        catalog = save_visualization_catalog(all_visualizations, catalog_path)
+        catalog = visualize(df, stats, output_dir)
+        (output_dir / CACHE_KEY_FILE).write_text(cache_key)
         
-        print(f"✅ Data visualization completed! Created {len(all_visualizations)} visualizations")
+        print(f"✅ Data visualization completed! Created {catalog['visualizations_created']} visualizations")
         return catalog
         
     except Exception as e: